@@ -19,6 +19,8 @@ class UserAdmin(BaseUserAdmin):
     search_fields = ['email', 'first_name', 'last_name']
     readonly_fields = ['id', 'date_joined', 'last_login']
     ordering = ['-date_joined']
+    list_select_related = ['company']
+    autocomplete_fields = ['company']
     
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
@@ -5,3 +5,10 @@ class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.authentication'
     verbose_name = 'Authentication'
+    
+    def ready(self):
+        # Build the password validators at startup rather than on the first
+        # register/password-change request (CommonPasswordValidator loads
+        # its password list from disk when instantiated)
+        from django.contrib.auth.password_validation import get_default_password_validators
+        get_default_password_validators()
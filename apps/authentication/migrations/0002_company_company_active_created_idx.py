@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 01:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="company",
+            index=models.Index(
+                fields=["is_active", "-created_at"], name="company_active_created_idx"
+            ),
+        ),
+    ]
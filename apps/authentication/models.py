@@ -39,6 +39,10 @@ class Company(models.Model):
         verbose_name = 'Company'
         verbose_name_plural = 'Companies'
         ordering = ['-created_at']
+        indexes = [
+            # Active company listing, newest first
+            models.Index(fields=['is_active', '-created_at'], name='company_active_created_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -78,6 +82,13 @@ class UserManager(BaseUserManager):
             raise ValueError('Superuser must have is_superuser=True.')
         
         return self.create_user(email, password, **extra_fields)
+    
+    def get_by_natural_key(self, username):
+        """
+        Fetch a user by email with the company joined in.
+        Used by authenticate() on login, where the token claims need the company.
+        """
+        return self.select_related('company').get(**{self.model.USERNAME_FIELD: username})
 
 
 class User(AbstractBaseUser, PermissionsMixin):
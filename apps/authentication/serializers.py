@@ -8,6 +8,7 @@ from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.db import IntegrityError, transaction
 from django.utils.text import slugify
 
 from .models import Company
@@ -31,27 +32,31 @@ class CompanyCreateSerializer(serializers.ModelSerializer):
         model = Company
         fields = ['name', 'email', 'phone', 'address']
     
-    def validate_name(self, value):
-        """Validate and generate slug from name."""
-        slug = slugify(value)
-        if Company.objects.filter(slug=slug).exists():
-            raise serializers.ValidationError(
-                "A company with a similar name already exists."
-            )
-        return value
+    def validate(self, attrs):
+        """Generate the slug once from the name."""
+        if 'name' in attrs:
+            attrs['slug'] = slugify(attrs['name'])
+        return attrs
     
     def create(self, validated_data):
-        """Create company with auto-generated slug and db_name."""
-        slug = slugify(validated_data['name'])
-        validated_data['slug'] = slug
-        validated_data['db_name'] = f"tenant_{slug}"
-        return super().create(validated_data)
+        """
+        Create company with auto-generated slug and db_name.
+        Slug collisions are caught by the unique constraint on slug.
+        """
+        validated_data['db_name'] = f"tenant_{validated_data['slug']}"
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({
+                'name': "A company with a similar name already exists."
+            })
 
 
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for User model."""
     
-    company = CompanySerializer(read_only=True)
+    company = serializers.SerializerMethodField()
     full_name = serializers.CharField(read_only=True)
     
     class Meta:
@@ -61,6 +66,13 @@ class UserSerializer(serializers.ModelSerializer):
             'company', 'role', 'is_active', 'is_verified', 'date_joined'
         ]
         read_only_fields = ['id', 'date_joined', 'is_verified']
+    
+    def get_company(self, obj):
+        """Get a compact company summary (the fields carried in the JWT)."""
+        company = obj.company
+        if company is None:
+            return None
+        return {'id': str(company.id), 'slug': company.slug, 'name': company.name}
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -104,12 +116,15 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             })
         
         if company_id:
-            try:
-                attrs['company'] = Company.objects.get(id=company_id, is_active=True)
-            except Company.DoesNotExist:
+            # Only load the columns the registration response serializes
+            company = Company.objects.only(
+                'id', 'slug', 'name'
+            ).filter(id=company_id, is_active=True).first()
+            if company is None:
                 raise serializers.ValidationError({
                     'company_id': "Company not found or inactive."
                 })
+            attrs['company'] = company
         
         return attrs
     
@@ -121,24 +136,27 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         validated_data.pop('company_id', None)
         company = validated_data.pop('company', None)
         
-        # Create new company if company_name provided
-        if company_name and not company:
-            slug = slugify(company_name)
-            company = Company.objects.create(
-                name=company_name,
-                slug=slug,
-                email=validated_data['email'],  # Use user's email for company
-                db_name=f"tenant_{slug}"
+        # Company and user are committed together (one commit instead of two,
+        # and no orphaned company if the user insert fails)
+        with transaction.atomic(using='default'):
+            # Create new company if company_name provided
+            if company_name and not company:
+                slug = slugify(company_name)
+                company = Company.objects.create(
+                    name=company_name,
+                    slug=slug,
+                    email=validated_data['email'],  # Use user's email for company
+                    db_name=f"tenant_{slug}"
+                )
+                # First user of a new company becomes admin
+                validated_data['role'] = 'admin'
+            
+            validated_data['company'] = company
+            
+            user = User.objects.create_user(
+                password=password,
+                **validated_data
             )
-            # First user of a new company becomes admin
-            validated_data['role'] = 'admin'
-        
-        validated_data['company'] = company
-        
-        user = User.objects.create_user(
-            password=password,
-            **validated_data
-        )
         
         return user
 
@@ -171,8 +189,8 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         """Validate and add user data to response."""
         data = super().validate(attrs)
         
-        # Add user info to response
-        data['user'] = UserSerializer(self.user).data
+        # Add user info to response (materialized once as a plain dict)
+        data['user'] = dict(UserSerializer(self.user).data)
         
         return data
 
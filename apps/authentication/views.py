@@ -4,6 +4,8 @@ Authentication Views
 API endpoints for user authentication and management.
 """
 
+import logging
+
 from rest_framework import status, generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -21,9 +23,11 @@ from .serializers import (
 )
 from .models import Company
 from apps.core.db_router import get_tenant_db_alias
+from apps.core.pagination import StandardResultsPagination
 from scripts.create_tenant_db import create_tenant_database
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 class RegisterView(generics.CreateAPIView):
@@ -46,23 +50,18 @@ class RegisterView(generics.CreateAPIView):
         user = serializer.save()
         
         # If a new company was created, set up the tenant database
+        # (a copy of the schema template, so it's done before the tokens
+        # are returned and the first tenant request can't race it)
         if user.company and request.data.get('company_name'):
             try:
                 create_tenant_database(user.company.slug)
             except Exception as e:
                 # Log the error but don't fail the registration
-                import logging
-                logger = logging.getLogger(__name__)
                 logger.error(f"Failed to create tenant database: {e}")
         
-        # Generate tokens for the new user
-        refresh = RefreshToken.for_user(user)
-        
-        # Add company info to token
-        if user.company:
-            refresh['company_id'] = str(user.company.id)
-            refresh['company_slug'] = user.company.slug
-            refresh['company_name'] = user.company.name
+        # Generate tokens with the same claims as login (incl. company info)
+        refresh = CustomTokenObtainPairSerializer.get_token(user)
+        access = refresh.access_token
         
         return Response({
             'success': True,
@@ -71,7 +70,7 @@ class RegisterView(generics.CreateAPIView):
                 'user': UserSerializer(user).data,
                 'tokens': {
                     'refresh': str(refresh),
-                    'access': str(refresh.access_token),
+                    'access': str(access),
                 }
             }
         }, status=status.HTTP_201_CREATED)
@@ -169,7 +168,8 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     
     def get_object(self):
-        return self.request.user
+        # Load the company in the same query, UserSerializer nests it
+        return User.objects.select_related('company').get(pk=self.request.user.pk)
     
     def retrieve(self, request, *args, **kwargs):
         user = self.get_object()
@@ -227,11 +227,23 @@ class CompanyListView(generics.ListAPIView):
     """
     permission_classes = [AllowAny]
     serializer_class = CompanySerializer
-    queryset = Company.objects.filter(is_active=True)
+    pagination_class = StandardResultsPagination
+    # Rows are read as plain dicts of exactly the CompanySerializer fields;
+    # the JSON renderer handles the UUID/datetime values the same way
+    queryset = Company.objects.filter(is_active=True).values(
+        *CompanySerializer.Meta.fields
+    ).order_by('-created_at')
     
     def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        
+        if page is not None:
+            data = self.get_paginated_response(page).data
+        else:
+            data = list(queryset)
+        
         return Response({
             'success': True,
-            'data': response.data
+            'data': data
         })
@@ -0,0 +1,22 @@
+"""
+Custom Authentication Classes for REST Framework
+"""
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class TenantJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that reuses the token already validated by
+    TenantMiddleware, so the signature is only verified once per request.
+    
+    Falls back to regular JWT authentication when the middleware didn't
+    validate a token (e.g. public paths).
+    """
+    
+    def authenticate(self, request):
+        validated_token = getattr(request, '_cached_jwt_token', None)
+        if validated_token is None:
+            return super().authenticate(request)
+        
+        return self.get_user(validated_token), validated_token
@@ -6,12 +6,55 @@ This router directs database operations to the appropriate database:
 - Tenant databases: Product, ProductImage (isolated per company)
 """
 
+import copy
 import threading
 from django.conf import settings
 
 # Thread-local storage for current tenant database
 _thread_locals = threading.local()
 
+# Tenant aliases already present in settings.DATABASES.
+# Registration is guarded by the lock so concurrent requests for a new
+# tenant don't race on the shared DATABASES dict.
+_known_aliases = set()
+_alias_lock = threading.RLock()
+
+# Connection settings shared by every tenant database (NAME is filled per tenant)
+_TENANT_DB_TEMPLATE = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': None,
+    'ATOMIC_REQUESTS': False,
+    'AUTOCOMMIT': True,
+    'CONN_MAX_AGE': 0,
+    'CONN_HEALTH_CHECKS': False,
+    'OPTIONS': {
+        # journal_mode=WAL comes first: new tenant files already use it (a
+        # no-op for them) and files created before WAL are converted on
+        # first connect. synchronous=NORMAL is only crash-safe in WAL mode;
+        # there it skips the fsync on every commit. The rest are
+        # per-connection tuning.
+        'init_command': (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            'PRAGMA cache_size=-65536;'
+            'PRAGMA temp_store=MEMORY;'
+            'PRAGMA mmap_size=268435456;'
+        ),
+    },
+    'TIME_ZONE': None,
+    'USER': '',
+    'PASSWORD': '',
+    'HOST': '',
+    'PORT': '',
+    'TEST': {
+        'CHARSET': None,
+        'COLLATION': None,
+        'MIGRATE': True,
+        'MIRROR': None,
+        'NAME': None,
+    },
+}
+
 
 def get_current_db_name():
     """Get the current tenant database name from thread-local storage."""
@@ -36,30 +79,17 @@ def get_tenant_db_alias(company_slug):
     """
     db_alias = f'tenant_{company_slug}'
     
-    if db_alias not in settings.DATABASES:
-        # Dynamically add tenant database configuration
-        db_path = settings.TENANT_DB_DIR / f'{company_slug}_db.sqlite3'
-        settings.DATABASES[db_alias] = {
-            'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': db_path,
-            'ATOMIC_REQUESTS': False,
-            'AUTOCOMMIT': True,
-            'CONN_MAX_AGE': 0,
-            'CONN_HEALTH_CHECKS': False,
-            'OPTIONS': {},
-            'TIME_ZONE': None,
-            'USER': '',
-            'PASSWORD': '',
-            'HOST': '',
-            'PORT': '',
-            'TEST': {
-                'CHARSET': None,
-                'COLLATION': None,
-                'MIGRATE': True,
-                'MIRROR': None,
-                'NAME': None,
-            },
-        }
+    # Fast path: alias already registered by an earlier request
+    if db_alias in _known_aliases:
+        return db_alias
+    
+    with _alias_lock:
+        if db_alias not in settings.DATABASES:
+            # Dynamically add tenant database configuration
+            db_config = copy.deepcopy(_TENANT_DB_TEMPLATE)
+            db_config['NAME'] = settings.TENANT_DB_DIR / f'{company_slug}_db.sqlite3'
+            settings.DATABASES[db_alias] = db_config
+        _known_aliases.add(db_alias)
     
     return db_alias
 
@@ -75,46 +105,24 @@ class TenantDatabaseRouter:
     """
     
     # Models that should always use the default database
-    DEFAULT_DB_APPS = {'authentication', 'auth', 'contenttypes', 'sessions', 'admin'}
+    DEFAULT_DB_APPS = frozenset({'authentication', 'auth', 'contenttypes', 'sessions', 'admin'})
     
     # Models that should use tenant databases
-    TENANT_DB_APPS = {'products'}
+    TENANT_DB_APPS = frozenset({'products'})
     
-    def db_for_read(self, model, **hints):
+    def _route(self, model, **hints):
         """
-        Route read operations to the appropriate database.
+        Route read and write operations to the appropriate database.
+        Tenant models go to the current tenant database, everything else
+        (and tenant models without a tenant context) to default.
         """
-        app_label = model._meta.app_label
-        
-        if app_label in self.DEFAULT_DB_APPS:
-            return 'default'
-        
-        if app_label in self.TENANT_DB_APPS:
-            db_name = get_current_db_name()
-            if db_name:
-                return db_name
-            # Fallback to default if no tenant context
-            return 'default'
-        
+        if model._meta.app_label in self.TENANT_DB_APPS:
+            return get_current_db_name() or 'default'
         return 'default'
     
-    def db_for_write(self, model, **hints):
-        """
-        Route write operations to the appropriate database.
-        """
-        app_label = model._meta.app_label
-        
-        if app_label in self.DEFAULT_DB_APPS:
-            return 'default'
-        
-        if app_label in self.TENANT_DB_APPS:
-            db_name = get_current_db_name()
-            if db_name:
-                return db_name
-            # Fallback to default if no tenant context
-            return 'default'
-        
-        return 'default'
+    # Called on every ORM query; reads and writes share one routing rule
+    db_for_read = _route
+    db_for_write = _route
     
     def allow_relation(self, obj1, obj2, **hints):
         """
@@ -142,8 +150,9 @@ class TenantDatabaseRouter:
             return db == 'default'
         
         if app_label in self.TENANT_DB_APPS:
-            # Allow migration to any non-default database (tenant dbs)
-            # or to default during initial setup
-            return db != 'default' or db == 'default'
+            # Tenant tables migrate to every database: the tenant dbs, and
+            # default, which serves product queries without a tenant context
+            # (e.g. the Django admin)
+            return True
         
         return db == 'default'
@@ -50,14 +50,13 @@ def custom_exception_handler(exc, context):
 
 def get_error_message(exc):
     """Get a human-readable error message from the exception."""
-    if hasattr(exc, 'detail'):
-        if isinstance(exc.detail, dict):
-            # Get the first error message
-            for key, value in exc.detail.items():
-                if isinstance(value, list):
-                    return f"{key}: {value[0]}"
-                return f"{key}: {value}"
-        elif isinstance(exc.detail, list):
-            return exc.detail[0] if exc.detail else str(exc)
-        return str(exc.detail)
-    return str(exc)
+    detail = getattr(exc, 'detail', None)
+    if detail is None:
+        return str(exc)
+    if isinstance(detail, dict) and detail:
+        # Use the first field's first error message
+        key, value = next(iter(detail.items()))
+        return f"{key}: {value[0] if isinstance(value, list) else value}"
+    if isinstance(detail, list):
+        return detail[0] if detail else str(exc)
+    return str(detail)
@@ -7,7 +7,12 @@ This middleware:
 3. Sets the appropriate tenant database context
 """
 
+import hashlib
 import logging
+import threading
+import time
+
+from cachetools import TTLCache
 from django.http import JsonResponse
 from django.conf import settings
 from rest_framework_simplejwt.authentication import JWTAuthentication
@@ -17,6 +22,16 @@ from .db_router import set_current_db_name, clear_current_db_name, get_tenant_db
 
 logger = logging.getLogger(__name__)
 
+_BEARER_PREFIX = 'Bearer '
+_BEARER_PREFIX_LEN = len(_BEARER_PREFIX)
+
+# Short-lived cache of successfully validated tokens, so repeat requests with
+# the same token skip signature verification.
+# Key: truncated SHA-256 of the raw token -> (tenant db alias, validated token)
+# Only valid tokens are ever stored; failures are never cached.
+_token_cache = TTLCache(maxsize=10000, ttl=30)
+_token_cache_lock = threading.Lock()
+
 
 class TenantMiddleware:
     """
@@ -31,14 +46,15 @@ class TenantMiddleware:
     """
     
     # Endpoints that don't require authentication
-    PUBLIC_PATHS = [
+    # (a tuple, so _is_public_path can test all prefixes in one startswith call)
+    PUBLIC_PATHS = (
         '/api/auth/login/',
         '/api/auth/register/',
         '/api/auth/token/refresh/',
         '/admin/',
         '/static/',
         '/media/',
-    ]
+    )
     
     def __init__(self, get_response):
         self.get_response = get_response
@@ -57,7 +73,7 @@ class TenantMiddleware:
             tenant_db = self._get_tenant_from_request(request)
             if tenant_db:
                 set_current_db_name(tenant_db)
-                logger.debug(f"Set tenant database context: {tenant_db}")
+                logger.debug("Set tenant database context: %s", tenant_db)
         except InvalidToken as e:
             logger.warning(f"Invalid token: {e}")
             return JsonResponse(
@@ -85,10 +101,7 @@ class TenantMiddleware:
     
     def _is_public_path(self, path):
         """Check if the path is public (doesn't require authentication)."""
-        for public_path in self.PUBLIC_PATHS:
-            if path.startswith(public_path):
-                return True
-        return False
+        return path.startswith(self.PUBLIC_PATHS)
     
     def _get_tenant_from_request(self, request):
         """
@@ -97,23 +110,41 @@ class TenantMiddleware:
         """
         auth_header = request.META.get('HTTP_AUTHORIZATION', '')
         
-        if not auth_header or not auth_header.startswith('Bearer '):
+        # Bail out on empty or prefix-only headers in one check
+        if len(auth_header) <= _BEARER_PREFIX_LEN or not auth_header.startswith(_BEARER_PREFIX):
             return None
         
-        # Validate and decode the token
-        validated_token = self.jwt_auth.get_validated_token(
-            auth_header.split(' ')[1]
-        )
+        raw_token = auth_header[_BEARER_PREFIX_LEN:].strip()
+        cache_key = hashlib.sha256(raw_token.encode()).digest()[:16]
         
-        # Extract company_slug from token payload
-        company_slug = validated_token.get('company_slug')
+        with _token_cache_lock:
+            cached = _token_cache.get(cache_key)
         
-        if not company_slug:
-            logger.warning("Token missing company_slug claim")
-            return None
+        # A cache hit carries the resolved tenant alias, so neither the
+        # signature check nor the alias lookup runs again
+        if cached is not None and cached[1]['exp'] > time.time():
+            tenant_db, validated_token = cached
+        else:
+            # Validate and decode the token
+            validated_token = self.jwt_auth.get_validated_token(raw_token)
+            
+            # Extract company_slug from token payload
+            company_slug = validated_token.get('company_slug')
+            
+            if not company_slug:
+                logger.warning("Token missing company_slug claim")
+                tenant_db = None
+            else:
+                # Get or create the tenant database configuration
+                tenant_db = get_tenant_db_alias(company_slug)
+            
+            with _token_cache_lock:
+                _token_cache[cache_key] = (tenant_db, validated_token)
         
-        # Get or create the tenant database configuration
-        return get_tenant_db_alias(company_slug)
+        # Hand the validated token to DRF (see TenantJWTAuthentication)
+        request._cached_jwt_token = validated_token
+        
+        return tenant_db
 
 
 class RequestLoggingMiddleware:
@@ -126,12 +157,16 @@ class RequestLoggingMiddleware:
         self.get_response = get_response
     
     def __call__(self, request):
+        # Skip the logging calls entirely when INFO is disabled
+        if not logger.isEnabledFor(logging.INFO):
+            return self.get_response(request)
+        
         # Log the request
-        logger.info(f"{request.method} {request.path}")
+        logger.info("%s %s", request.method, request.path)
         
         response = self.get_response(request)
         
         # Log the response status
-        logger.info(f"{request.method} {request.path} -> {response.status_code}")
+        logger.info("%s %s -> %s", request.method, request.path, response.status_code)
         
         return response
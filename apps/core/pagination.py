@@ -0,0 +1,16 @@
+"""
+Pagination Classes for API list endpoints
+"""
+
+from rest_framework.pagination import PageNumberPagination
+
+
+class StandardResultsPagination(PageNumberPagination):
+    """
+    Page number pagination with a bounded page size.
+    Clients can request a smaller or larger page via ?page_size=,
+    capped at max_page_size.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 100
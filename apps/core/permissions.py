@@ -7,6 +7,23 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_SAFE_METHODS = frozenset(permissions.SAFE_METHODS)
+
+
+def _get_user_context(request):
+    """
+    Return (has_company, role) for the request user, computed once per request.
+    
+    Uses company_id rather than company so the check never loads the
+    Company row.
+    """
+    context = getattr(request, '_perm_cache', None)
+    if context is None:
+        user = request.user
+        context = (getattr(user, 'company_id', None) is not None, getattr(user, 'role', None))
+        request._perm_cache = context
+    return context
+
 
 class IsCompanyMember(permissions.BasePermission):
     """
@@ -20,7 +37,8 @@ class IsCompanyMember(permissions.BasePermission):
             return False
         
         # Check if user has a company
-        if not hasattr(request.user, 'company') or not request.user.company:
+        has_company, _ = _get_user_context(request)
+        if not has_company:
             logger.warning(f"User {request.user.id} has no associated company")
             return False
         
@@ -37,10 +55,11 @@ class IsCompanyAdmin(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        if not hasattr(request.user, 'company') or not request.user.company:
+        has_company, role = _get_user_context(request)
+        if not has_company:
             return False
         
-        return request.user.role == 'admin'
+        return role == 'admin'
 
 
 class IsCompanyAdminOrReadOnly(permissions.BasePermission):
@@ -54,15 +73,16 @@ class IsCompanyAdminOrReadOnly(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        if not hasattr(request.user, 'company') or not request.user.company:
+        has_company, role = _get_user_context(request)
+        if not has_company:
             return False
         
         # Allow read-only access for all authenticated company members
-        if request.method in permissions.SAFE_METHODS:
+        if request.method in _SAFE_METHODS:
             return True
         
         # Write access only for admins
-        return request.user.role == 'admin'
+        return role == 'admin'
 
 
 class CanManageProducts(permissions.BasePermission):
@@ -77,12 +97,13 @@ class CanManageProducts(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        if not hasattr(request.user, 'company') or not request.user.company:
+        has_company, role = _get_user_context(request)
+        if not has_company:
             return False
         
         # Allow read-only access for all
-        if request.method in permissions.SAFE_METHODS:
+        if request.method in _SAFE_METHODS:
             return True
         
         # Write access for admins and managers
-        return request.user.role in ['admin', 'manager']
+        return role in ('admin', 'manager')
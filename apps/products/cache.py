@@ -0,0 +1,39 @@
+"""
+Product List Cache
+
+Caches the product list response per tenant. Each tenant has a version
+counter that is part of every cache key; bumping it on any product or
+image write makes all of that tenant's cached pages unreachable at once.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+
+# Seconds a cached list page is served before it is rebuilt
+LIST_CACHE_TTL = 30
+
+
+def _version_key(db_name):
+    return f'products:list-version:{db_name}'
+
+
+def get_list_cache_key(db_name, request):
+    """
+    Build the cache key for a product list request.
+    
+    Includes the tenant, its current version, the query string, and the
+    scheme/host (image URLs in the response are absolute).
+    """
+    version = cache.get_or_set(_version_key(db_name), 1, timeout=None)
+    query = hashlib.md5(request.GET.urlencode().encode()).hexdigest()
+    return f'products:list:{db_name}:{version}:{request.scheme}://{request.get_host()}:{query}'
+
+
+def invalidate_list_cache(db_name):
+    """Drop every cached product list page of a tenant."""
+    try:
+        cache.incr(_version_key(db_name))
+    except ValueError:
+        # No version stored yet, so nothing is cached for this tenant
+        cache.set(_version_key(db_name), 1, timeout=None)
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-15 01:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["status", "-created_at"], name="product_status_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("is_featured", True)),
+                fields=["-created_at"],
+                name="product_featured_created_idx",
+            ),
+        ),
+    ]
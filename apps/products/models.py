@@ -6,7 +6,7 @@ These models are stored in tenant databases (isolated per company):
 - ProductImage: Product images (multiple per product)
 """
 
-from django.db import models
+from django.db import models, router, transaction
 from django.utils.text import slugify
 import uuid
 import os
@@ -67,20 +67,62 @@ class Product(models.Model):
         verbose_name = 'Product'
         verbose_name_plural = 'Products'
         ordering = ['-created_at']
+        indexes = [
+            # List filters, newest first
+            models.Index(fields=['status', '-created_at'], name='product_status_created_idx'),
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(is_featured=True),
+                name='product_featured_created_idx',
+            ),
+        ]
     
     def __str__(self):
         return self.name
     
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.name)
-            # Ensure unique slug
-            original_slug = self.slug
+            self.slug = self._unique_slug(slugify(self.name))
+        super().save(*args, **kwargs)
+    
+    def _unique_slug(self, base_slug):
+        """Return base_slug, or base_slug-N with the smallest free N."""
+        return self.free_slugs([base_slug], exclude_pk=self.pk)[0]
+    
+    @classmethod
+    def free_slugs(cls, base_slugs, using=None, exclude_pk=None):
+        """
+        Return a free slug for each of base_slugs, in order.
+        Fetches all colliding slugs in a single query; repeated bases
+        get distinct suffixes.
+        """
+        if not base_slugs:
+            return []
+        # Each base_slug itself plus the range of "base_slug-..." slugs ('.'
+        # sorts right after '-'), which SQLite can answer from the slug
+        # index, unlike startswith (a case-insensitive LIKE). Also bounded
+        # when slugify() returned '' for a name with no ASCII characters.
+        collisions = models.Q()
+        for base_slug in set(base_slugs):
+            collisions |= models.Q(slug=base_slug) | models.Q(
+                slug__gte=base_slug + '-', slug__lt=base_slug + '.'
+            )
+        queryset = cls.objects.db_manager(using).filter(collisions)
+        if exclude_pk is not None:
+            queryset = queryset.exclude(pk=exclude_pk)
+        taken = set(queryset.order_by().values_list('slug', flat=True))
+        
+        slugs = []
+        for base_slug in base_slugs:
+            slug = base_slug
             counter = 1
-            while Product.objects.filter(slug=self.slug).exclude(pk=self.pk).exists():
-                self.slug = f"{original_slug}-{counter}"
+            while slug in taken:
+                slug = f"{base_slug}-{counter}"
                 counter += 1
-        super().save(*args, **kwargs)
+            # Later slugs in this batch must not reuse it
+            taken.add(slug)
+            slugs.append(slug)
+        return slugs
     
     @property
     def primary_image(self):
@@ -119,16 +161,53 @@ class ProductImage(models.Model):
     def __str__(self):
         return f"Image for {self.product.name}"
     
+    @classmethod
+    def bulk_create_for_product(cls, product, image_files, primary_index=None, start_order=0):
+        """
+        Create several images for a product with a single INSERT.
+        
+        bulk_create() bypasses save(), so the primary-image bookkeeping is
+        done here: the image at primary_index (if any) becomes primary and
+        the product's other images are cleared with one UPDATE.
+        """
+        images = [
+            cls(
+                product=product,
+                image=image_file,
+                is_primary=(index == primary_index),
+                sort_order=start_order + index,
+            )
+            for index, image_file in enumerate(image_files)
+        ]
+        
+        with transaction.atomic(using=router.db_for_write(cls)):
+            cls.objects.bulk_create(images)
+            
+            primary = next((image for image in images if image.is_primary), None)
+            if primary is not None:
+                cls.objects.filter(
+                    product_id=product.pk,
+                    is_primary=True
+                ).exclude(pk=primary.pk).update(is_primary=False)
+        
+        return images
+    
     def save(self, *args, **kwargs):
         # If this is the first image for the product, make it primary
-        if not self.pk and not ProductImage.objects.filter(product=self.product).exists():
+        # (only worth a query when the image isn't already primary)
+        if (
+            not self.is_primary
+            and self._state.adding
+            and not ProductImage.objects.filter(product_id=self.product_id).exists()
+        ):
             self.is_primary = True
         
-        # If setting as primary, remove primary from other images
-        if self.is_primary:
-            ProductImage.objects.filter(
-                product=self.product,
-                is_primary=True
-            ).exclude(pk=self.pk).update(is_primary=False)
-        
-        super().save(*args, **kwargs)
+        with transaction.atomic(using=kwargs.get('using') or router.db_for_write(ProductImage)):
+            super().save(*args, **kwargs)
+            
+            # If setting as primary, remove primary from other images
+            if self.is_primary:
+                ProductImage.objects.filter(
+                    product_id=self.product_id,
+                    is_primary=True
+                ).exclude(pk=self.pk).update(is_primary=False)
@@ -7,8 +7,36 @@ Serializers for product CRUD operations with image handling.
 from rest_framework import serializers
 from .models import Product, ProductImage
 
+# Leading bytes of the accepted upload formats (WebP is checked separately)
+_IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
 
-class ProductImageSerializer(serializers.ModelSerializer):
+
+class AbsoluteURLMixin:
+    """
+    Builds absolute media URLs from a scheme://host base computed once per
+    request and kept in the (root) serializer context, instead of calling
+    request.build_absolute_uri() for every image.
+    """
+    
+    def build_absolute_url(self, url):
+        request = self.context.get('request')
+        if not request:
+            return url
+        if not url.startswith('/'):
+            # Already absolute (e.g. media served from another host)
+            return request.build_absolute_uri(url)
+        base = self.context.get('_abs_base')
+        if base is None:
+            base = self.context['_abs_base'] = f"{request.scheme}://{request.get_host()}"
+        return base + url
+
+
+class ProductImageSerializer(AbsoluteURLMixin, serializers.ModelSerializer):
     """Serializer for ProductImage model."""
     
     image_url = serializers.SerializerMethodField()
@@ -20,15 +48,12 @@ class ProductImageSerializer(serializers.ModelSerializer):
     
     def get_image_url(self, obj):
         """Get the full URL for the image."""
-        request = self.context.get('request')
-        if obj.image and request:
-            return request.build_absolute_uri(obj.image.url)
-        elif obj.image:
-            return obj.image.url
+        if obj.image:
+            return self.build_absolute_url(obj.image.url)
         return None
 
 
-class ProductListSerializer(serializers.ModelSerializer):
+class ProductListSerializer(AbsoluteURLMixin, serializers.ModelSerializer):
     """Serializer for listing products (lightweight)."""
     
     primary_image = serializers.SerializerMethodField()
@@ -42,12 +67,16 @@ class ProductListSerializer(serializers.ModelSerializer):
     
     def get_primary_image(self, obj):
         """Get the primary image URL."""
+        # The list view annotates the image path, so no image rows are loaded
+        if hasattr(obj, 'primary_image_path'):
+            if not obj.primary_image_path:
+                return None
+            storage = ProductImage._meta.get_field('image').storage
+            return self.build_absolute_url(storage.url(obj.primary_image_path))
+        
         image = obj.primary_image
         if image and image.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(image.image.url)
-            return image.image.url
+            return self.build_absolute_url(image.image.url)
         return None
 
 
@@ -97,14 +126,9 @@ class ProductCreateSerializer(serializers.ModelSerializer):
         
         product = Product.objects.create(**validated_data)
         
-        # Create product images
-        for index, image_data in enumerate(images_data):
-            ProductImage.objects.create(
-                product=product,
-                image=image_data,
-                is_primary=(index == 0),  # First image is primary
-                sort_order=index
-            )
+        # Create product images (first image is primary)
+        if images_data:
+            ProductImage.bulk_create_for_product(product, images_data, primary_index=0)
         
         return product
 
@@ -129,6 +153,16 @@ class ProductUpdateSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+def sniff_image_type(head):
+    """Return the MIME type of an allowed image format from its first bytes, or None."""
+    for signature, mime in _IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return mime
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
 class ProductImageUploadSerializer(serializers.Serializer):
     """Serializer for uploading product images."""
     
@@ -143,20 +177,31 @@ class ProductImageUploadSerializer(serializers.Serializer):
         help_text="Index of image to set as primary (0-based)"
     )
     
-    def validate_images(self, value):
-        """Validate image files."""
+    def to_internal_value(self, data):
+        """
+        Reject oversized and non-image files before the image fields have
+        Pillow open each one. The type is sniffed from the file's first
+        bytes; the client-sent Content-Type header is not trusted.
+        """
         max_size = 5 * 1024 * 1024  # 5MB
-        allowed_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
+        # Files only arrive in multipart (QueryDict) data
+        images = data.getlist('images') if hasattr(data, 'getlist') else []
         
-        for image in value:
+        for image in images:
+            if not hasattr(image, 'read'):
+                continue  # Left to ImageField to reject
             if image.size > max_size:
-                raise serializers.ValidationError(
-                    f"Image {image.name} exceeds maximum size of 5MB"
-                )
-            if image.content_type not in allowed_types:
-                raise serializers.ValidationError(
-                    f"Image {image.name} has unsupported format. "
-                    f"Allowed: JPEG, PNG, GIF, WebP"
-                )
+                raise serializers.ValidationError({
+                    'images': [f"Image {image.name} exceeds maximum size of 5MB"]
+                })
+            head = image.read(512)
+            image.seek(0)
+            if sniff_image_type(head) is None:
+                raise serializers.ValidationError({
+                    'images': [
+                        f"Image {image.name} has unsupported format. "
+                        f"Allowed: JPEG, PNG, GIF, WebP"
+                    ]
+                })
         
-        return value
+        return super().to_internal_value(data)
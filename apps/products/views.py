@@ -9,6 +9,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
 
 from .models import Product, ProductImage
 from .serializers import (
@@ -21,6 +23,7 @@ from .serializers import (
 )
 from apps.core.permissions import CanManageProducts
 from apps.core.db_router import get_current_db_name
+from .cache import LIST_CACHE_TTL, get_list_cache_key, invalidate_list_cache
 
 
 class ProductViewSet(viewsets.ModelViewSet):
@@ -65,6 +68,18 @@ class ProductViewSet(viewsets.ModelViewSet):
         else:
             queryset = Product.objects.all()
         
+        if self.action == 'list':
+            # Only load the columns ProductListSerializer emits, plus the
+            # primary image path via a subquery (primary image first, same
+            # order as Product.primary_image), so the list is a single query
+            primary_image = ProductImage.objects.filter(
+                product=OuterRef('pk')
+            ).order_by('-is_primary', 'sort_order', '-created_at').values('image')[:1]
+            queryset = queryset.only(
+                'id', 'name', 'slug', 'price', 'quantity',
+                'status', 'is_featured', 'created_at'
+            ).annotate(primary_image_path=Subquery(primary_image))
+        
         # Filter by status if provided
         status_filter = self.request.query_params.get('status')
         if status_filter:
@@ -83,19 +98,27 @@ class ProductViewSet(viewsets.ModelViewSet):
         return queryset
     
     def list(self, request, *args, **kwargs):
-        """List products with pagination."""
+        """List products with pagination (cached per tenant and query)."""
+        cache_key = get_list_cache_key(get_current_db_name(), request)
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+        
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
         
         if page is not None:
             serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            data = self.get_paginated_response(serializer.data).data
+        else:
+            serializer = self.get_serializer(queryset, many=True)
+            data = {
+                'success': True,
+                'data': serializer.data
+            }
         
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({
-            'success': True,
-            'data': serializer.data
-        })
+        cache.set(cache_key, data, LIST_CACHE_TTL)
+        return Response(data)
     
     def retrieve(self, request, *args, **kwargs):
         """Get product details."""
@@ -111,6 +134,7 @@ class ProductViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         product = serializer.save()
+        invalidate_list_cache(get_current_db_name())
         
         return Response({
             'success': True,
@@ -125,6 +149,7 @@ class ProductViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         product = serializer.save()
+        invalidate_list_cache(get_current_db_name())
         
         return Response({
             'success': True,
@@ -136,6 +161,7 @@ class ProductViewSet(viewsets.ModelViewSet):
         """Delete a product."""
         instance = self.get_object()
         instance.delete()
+        invalidate_list_cache(get_current_db_name())
         
         return Response({
             'success': True,
@@ -169,21 +195,19 @@ class ProductViewSet(viewsets.ModelViewSet):
             images_data = serializer.validated_data['images']
             set_primary = serializer.validated_data.get('set_primary')
             
-            created_images = []
             existing_count = product.images.count()
             
-            for index, image_file in enumerate(images_data):
-                is_primary = False
-                if set_primary is not None and index == set_primary:
-                    is_primary = True
-                
-                product_image = ProductImage.objects.create(
-                    product=product,
-                    image=image_file,
-                    is_primary=is_primary,
-                    sort_order=existing_count + index
-                )
-                created_images.append(product_image)
+            # The first image of a product without images becomes primary
+            if set_primary is None and existing_count == 0:
+                set_primary = 0
+            
+            created_images = ProductImage.bulk_create_for_product(
+                product,
+                images_data,
+                primary_index=set_primary,
+                start_order=existing_count
+            )
+            invalidate_list_cache(get_current_db_name())
             
             return Response({
                 'success': True,
@@ -225,6 +249,7 @@ class ProductImageView(generics.RetrieveUpdateDestroyAPIView):
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        invalidate_list_cache(get_current_db_name())
         
         return Response({
             'success': True,
@@ -235,6 +260,7 @@ class ProductImageView(generics.RetrieveUpdateDestroyAPIView):
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         instance.delete()
+        invalidate_list_cache(get_current_db_name())
         
         return Response({
             'success': True,
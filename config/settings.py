@@ -111,6 +111,15 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# Argon2 is the default; PBKDF2 stays listed so existing hashes still verify
+# (they are upgraded to Argon2 on the next successful login)
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -128,19 +137,39 @@ MEDIA_ROOT = BASE_DIR / os.getenv('MEDIA_ROOT', 'media')
 # Create media directory if it doesn't exist
 Path(MEDIA_ROOT).mkdir(exist_ok=True)
 
+# Uploads larger than FILE_UPLOAD_MAX_MEMORY_SIZE are spooled to disk while
+# the request body is read. Spooling next to MEDIA_ROOT keeps them on the same
+# filesystem as the final location, so storing an image is a rename instead
+# of a second full copy on the request thread. It must stay outside
+# MEDIA_ROOT: /media/ is publicly served and these files are not validated yet.
+FILE_UPLOAD_TEMP_DIR = BASE_DIR / 'upload_tmp'
+FILE_UPLOAD_TEMP_DIR.mkdir(exist_ok=True)
+
+# Cache (product list responses)
+# The local-memory cache is per process: with several workers, a write only
+# invalidates the worker that handled it and the others serve their copy
+# until it expires (30s). Point this at a shared backend (e.g. Redis) in
+# production.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'product-management',
+    }
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.core.authentication.TenantJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.core.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -18,6 +18,7 @@ CREATE TABLE IF NOT EXISTS companies (
 
 CREATE INDEX IF NOT EXISTS idx_companies_slug ON companies(slug);
 CREATE INDEX IF NOT EXISTS idx_companies_is_active ON companies(is_active);
+CREATE INDEX IF NOT EXISTS company_active_created_idx ON companies(is_active, created_at DESC);
 
 -- Users table
 CREATE TABLE IF NOT EXISTS users (
@@ -28,6 +28,8 @@ CREATE INDEX IF NOT EXISTS idx_products_sku ON products(sku);
 CREATE INDEX IF NOT EXISTS idx_products_status ON products(status);
 CREATE INDEX IF NOT EXISTS idx_products_is_featured ON products(is_featured);
 CREATE INDEX IF NOT EXISTS idx_products_created_at ON products(created_at);
+CREATE INDEX IF NOT EXISTS product_status_created_idx ON products(status, created_at DESC);
+CREATE INDEX IF NOT EXISTS product_featured_created_idx ON products(created_at DESC) WHERE is_featured;
 
 -- Product Images table
 CREATE TABLE IF NOT EXISTS product_images (
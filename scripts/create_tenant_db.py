@@ -6,24 +6,188 @@ This script creates a new tenant database for a company.
 It runs migrations to set up the products schema.
 """
 
+import hashlib
 import os
+import shutil
 import sys
 import sqlite3
+import threading
+from functools import lru_cache
 from pathlib import Path
 
 # Add parent directory to path for imports
 BASE_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(BASE_DIR))
 
-# Load environment variables
-from dotenv import load_dotenv
-load_dotenv(BASE_DIR / '.env')
+# Load environment variables (skipped when the caller, e.g. Django
+# settings, has already loaded them)
+if 'TENANT_DB_DIR' not in os.environ:
+    from dotenv import load_dotenv
+    load_dotenv(BASE_DIR / '.env')
+
+# Tenant database directory (same setting as config/settings.py),
+# resolved and created once at import
+TENANT_DB_DIR = BASE_DIR / os.getenv('TENANT_DB_DIR', 'tenant_databases')
+TENANT_DB_DIR.mkdir(exist_ok=True)
+
+MIGRATION_FILE = BASE_DIR / 'migrations' / 'tenant_db_migration.sql'
+
+# Tenant database files are named <slug>_db.sqlite3
+_DB_FILE_SUFFIX = '_db.sqlite3'
+
+# Tenant schema used when the migration file is missing
+_TENANT_SCHEMA_STATEMENTS = (
+    # Products table
+    '''
+    CREATE TABLE IF NOT EXISTS products (
+        id TEXT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        slug VARCHAR(280) NOT NULL,
+        description TEXT,
+        price DECIMAL(10, 2) DEFAULT 0.00 NOT NULL,
+        cost_price DECIMAL(10, 2),
+        sku VARCHAR(100),
+        quantity INTEGER DEFAULT 0 NOT NULL,
+        status VARCHAR(20) DEFAULT 'draft' NOT NULL,
+        is_featured BOOLEAN DEFAULT FALSE NOT NULL,
+        meta_title VARCHAR(255),
+        meta_description TEXT,
+        created_by TEXT,
+        updated_by TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+    )
+    ''',
+    # Product Images table
+    '''
+    CREATE TABLE IF NOT EXISTS product_images (
+        id TEXT PRIMARY KEY,
+        product_id TEXT NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+        image VARCHAR(255) NOT NULL,
+        alt_text VARCHAR(255),
+        is_primary BOOLEAN DEFAULT FALSE NOT NULL,
+        sort_order INTEGER DEFAULT 0 NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+    )
+    ''',
+    # Indexes
+    'CREATE INDEX IF NOT EXISTS idx_products_name ON products(name)',
+    'CREATE INDEX IF NOT EXISTS idx_products_slug ON products(slug)',
+    'CREATE INDEX IF NOT EXISTS idx_products_status ON products(status)',
+    'CREATE INDEX IF NOT EXISTS product_status_created_idx ON products(status, created_at DESC)',
+    'CREATE INDEX IF NOT EXISTS product_featured_created_idx ON products(created_at DESC) WHERE is_featured',
+    'CREATE INDEX IF NOT EXISTS idx_product_images_product_id ON product_images(product_id)',
+)
+
+# The whole schema as one script, applied in a single transaction
+_TENANT_SCHEMA_SQL = 'BEGIN;\n' + ';\n'.join(_TENANT_SCHEMA_STATEMENTS) + ';\nCOMMIT;'
+
+
+@lru_cache(maxsize=1)
+def _load_migration_sql():
+    """Read the tenant migration script once per process (None if missing)."""
+    if not MIGRATION_FILE.exists():
+        return None
+    with open(MIGRATION_FILE, 'r') as f:
+        return f.read()
+
+
+def _get_template_db() -> Path:
+    """
+    Return the template database holding the tenant schema.
+    
+    The template is built on first use and named after a hash of the
+    schema, so a changed migration script gets a fresh template.
+    """
+    migration_sql = _load_migration_sql()
+    schema_sql = migration_sql if migration_sql is not None else _TENANT_SCHEMA_SQL
+    schema_hash = hashlib.sha1(schema_sql.encode()).hexdigest()[:12]
+    template_path = TENANT_DB_DIR / f"_template_{schema_hash}.sqlite3"
+    
+    if not template_path.exists():
+        # Build under a private name and move into place, so concurrent
+        # provisioning never copies a half-built template
+        tmp_path = template_path.with_name(
+            f"{template_path.name}.{os.getpid()}-{threading.get_ident()}.tmp"
+        )
+        conn = sqlite3.connect(tmp_path)
+        try:
+            # page_size only takes effect before the first table is created
+            conn.execute('PRAGMA page_size=8192')
+            _apply_tenant_schema(conn)
+            conn.close()
+            os.replace(tmp_path, template_path)
+        finally:
+            conn.close()
+            # Only still there if building or moving it failed
+            tmp_path.unlink(missing_ok=True)
+    
+    return template_path
+
+
+def _apply_tenant_schema(conn: sqlite3.Connection):
+    """Run the tenant migration script (or the fallback schema) on conn."""
+    # Keep temporary b-trees (index builds) in memory
+    conn.execute('PRAGMA temp_store=MEMORY')
+    
+    migration_sql = _load_migration_sql()
+    if migration_sql is not None:
+        # Execute the migration as one transaction (a single commit
+        # instead of one per CREATE statement)
+        conn.executescript('BEGIN;\n' + migration_sql + '\nCOMMIT;')
+    else:
+        print(f"Warning: Migration file not found: {MIGRATION_FILE}")
+        # Create tables manually as fallback
+        _create_tenant_tables(conn)
+
+
+def _has_tenant_schema(db_path: Path) -> bool:
+    """Whether the database file exists and already holds the products table."""
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    except sqlite3.OperationalError:
+        return False
+    try:
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products'"
+        ).fetchone() is not None
+    finally:
+        conn.close()
+
+
+def _clone_file(src: Path, dst: Path):
+    """
+    Copy src to a new file dst inside the kernel.
+    
+    copy_file_range lets copy-on-write filesystems (btrfs, XFS, ...)
+    share extents instead of copying data; elsewhere it is a plain
+    in-kernel copy. Falls back to a buffered copy if it is unavailable.
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'xb') as fdst:
+        if hasattr(os, 'copy_file_range'):
+            remaining = os.fstat(fsrc.fileno()).st_size
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if not copied:
+                        raise OSError("copy_file_range made no progress")
+                    remaining -= copied
+                return
+            except OSError:
+                # e.g. not supported across these filesystems
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        shutil.copyfileobj(fsrc, fdst)
 
 
 def create_tenant_database(company_slug: str, run_migrations: bool = True) -> str:
     """
     Create a new tenant database for a company.
     
+    The database file is cloned from a template that already holds the
+    schema, instead of running the migration DDL for every tenant.
+    
     Args:
         company_slug: The company's slug (used for database naming)
         run_migrations: Whether to run migrations on the new database
@@ -31,38 +195,37 @@ def create_tenant_database(company_slug: str, run_migrations: bool = True) -> st
     Returns:
         Path to the created database file
     """
-    # Get tenant database directory from settings
-    tenant_db_dir = BASE_DIR / os.getenv('TENANT_DB_DIR', 'tenant_databases')
-    tenant_db_dir.mkdir(exist_ok=True)
-    
     # Database file path
-    db_path = tenant_db_dir / f"{company_slug}_db.sqlite3"
+    db_path = TENANT_DB_DIR / f"{company_slug}{_DB_FILE_SUFFIX}"
     
-    if db_path.exists():
+    # An empty or schema-less file (e.g. one SQLite created when something
+    # connected to the tenant before it was provisioned) doesn't count
+    if db_path.exists() and (not run_migrations or _has_tenant_schema(db_path)):
         print(f"Database already exists: {db_path}")
         return str(db_path)
     
     print(f"Creating tenant database: {db_path}")
     
-    # Create the database by connecting to it
-    conn = sqlite3.connect(db_path)
-    
     if run_migrations:
-        # Read and execute the tenant migration script
-        migration_file = BASE_DIR / 'migrations' / 'tenant_db_migration.sql'
-        
-        if migration_file.exists():
-            with open(migration_file, 'r') as f:
-                migration_sql = f.read()
-            
-            # Execute the migration
-            conn.executescript(migration_sql)
-            print(f"Migrations applied successfully")
-        else:
-            print(f"Warning: Migration file not found: {migration_file}")
-            # Create tables manually as fallback
-            _create_tenant_tables(conn)
+        try:
+            _clone_file(_get_template_db(), db_path)
+        except FileExistsError:
+            # Fill the schema-less file in place; it may be open elsewhere,
+            # so it is not replaced
+            conn = sqlite3.connect(db_path)
+            _apply_tenant_schema(conn)
+            conn.close()
+        print("Migrations applied successfully")
     
+    # Create the database by connecting to it (opens the clone if any)
+    conn = sqlite3.connect(db_path)
+    if not run_migrations:
+        conn.execute('PRAGMA page_size=8192')
+    
+    # journal_mode=WAL is stored in the file, so it applies to every later
+    # connection (the per-connection PRAGMAs are set by Django via the
+    # tenant init_command)
+    conn.execute('PRAGMA journal_mode=WAL')
     conn.close()
     print(f"Tenant database created: {db_path}")
     
@@ -72,50 +235,19 @@ def create_tenant_database(company_slug: str, run_migrations: bool = True) -> st
 def _create_tenant_tables(conn: sqlite3.Connection):
     """Create tenant tables manually (fallback if migration file not found)."""
     
-    cursor = conn.cursor()
-    
-    # Products table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS products (
-            id TEXT PRIMARY KEY,
-            name VARCHAR(255) NOT NULL,
-            slug VARCHAR(280) NOT NULL,
-            description TEXT,
-            price DECIMAL(10, 2) DEFAULT 0.00 NOT NULL,
-            cost_price DECIMAL(10, 2),
-            sku VARCHAR(100),
-            quantity INTEGER DEFAULT 0 NOT NULL,
-            status VARCHAR(20) DEFAULT 'draft' NOT NULL,
-            is_featured BOOLEAN DEFAULT FALSE NOT NULL,
-            meta_title VARCHAR(255),
-            meta_description TEXT,
-            created_by TEXT,
-            updated_by TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
-        )
-    ''')
+    try:
+        conn.executescript(_TENANT_SCHEMA_SQL)
+    except sqlite3.OperationalError:
+        if conn.in_transaction:
+            conn.rollback()
+        # Re-run statement by statement to report the offending DDL
+        for statement in _TENANT_SCHEMA_STATEMENTS:
+            try:
+                conn.execute(statement)
+            except sqlite3.OperationalError as e:
+                raise sqlite3.OperationalError(f"{e} in: {statement.strip()}") from e
+        raise
     
-    # Product Images table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS product_images (
-            id TEXT PRIMARY KEY,
-            product_id TEXT NOT NULL REFERENCES products(id) ON DELETE CASCADE,
-            image VARCHAR(255) NOT NULL,
-            alt_text VARCHAR(255),
-            is_primary BOOLEAN DEFAULT FALSE NOT NULL,
-            sort_order INTEGER DEFAULT 0 NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
-        )
-    ''')
-    
-    # Create indexes
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_name ON products(name)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_slug ON products(slug)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_status ON products(status)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_product_images_product_id ON product_images(product_id)')
-    
-    conn.commit()
     print("Tenant tables created successfully")
 
 
@@ -129,11 +261,13 @@ def delete_tenant_database(company_slug: str) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    tenant_db_dir = BASE_DIR / os.getenv('TENANT_DB_DIR', 'tenant_databases')
-    db_path = tenant_db_dir / f"{company_slug}_db.sqlite3"
+    db_path = TENANT_DB_DIR / f"{company_slug}{_DB_FILE_SUFFIX}"
     
     if db_path.exists():
         os.remove(db_path)
+        # WAL mode leaves -wal/-shm sidecar files next to the database
+        for suffix in ('-wal', '-shm'):
+            db_path.with_name(db_path.name + suffix).unlink(missing_ok=True)
         print(f"Deleted tenant database: {db_path}")
         return True
     else:
@@ -143,18 +277,17 @@ def delete_tenant_database(company_slug: str) -> bool:
 
 def list_tenant_databases() -> list:
     """List all tenant databases."""
-    tenant_db_dir = BASE_DIR / os.getenv('TENANT_DB_DIR', 'tenant_databases')
-    
-    if not tenant_db_dir.exists():
-        return []
-    
+    # scandir entries carry their own (cached) stat, one syscall per file
     databases = []
-    for db_file in tenant_db_dir.glob("*_db.sqlite3"):
-        databases.append({
-            'slug': db_file.stem.replace('_db', ''),
-            'path': str(db_file),
-            'size': db_file.stat().st_size
-        })
+    with os.scandir(TENANT_DB_DIR) as entries:
+        for entry in entries:
+            if not entry.name.endswith(_DB_FILE_SUFFIX):
+                continue
+            databases.append({
+                'slug': entry.name[:-len(_DB_FILE_SUFFIX)],
+                'path': entry.path,
+                'size': entry.stat().st_size
+            })
     
     return databases
 
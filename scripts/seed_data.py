@@ -5,34 +5,29 @@ Sample Data Seeder Script
 This script seeds the database with sample data for testing.
 """
 
+import argparse
 import os
 import sys
 import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
-# Setup Django environment
+# Add parent directory to path for imports (Django is set up in main())
 BASE_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(BASE_DIR))
 
-from dotenv import load_dotenv
-load_dotenv(BASE_DIR / '.env')
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
-
-import django
-django.setup()
-
-from django.contrib.auth import get_user_model
-from apps.authentication.models import Company
-from apps.products.models import Product, ProductImage
-from apps.core.db_router import set_current_db_name, get_tenant_db_alias
-from scripts.create_tenant_db import create_tenant_database
-
-User = get_user_model()
+def _bulk_uuids(n):
+    """Generate n random (version 4) UUIDs from a single os.urandom call."""
+    raw = os.urandom(16 * n)
+    return [uuid.UUID(bytes=raw[i:i + 16], version=4) for i in range(0, 16 * n, 16)]
 
 
 def seed_companies():
     """Create sample companies."""
+    from apps.authentication.models import Company
+    from scripts.create_tenant_db import create_tenant_database
+    
     companies_data = [
         {
             'name': 'Acme Corporation',
@@ -57,7 +52,18 @@ def seed_companies():
         },
     ]
     
+    # Re-runs: a single query when every sample company already exists
+    existing = {
+        company.slug: company
+        for company in Company.objects.filter(slug__in=[data['slug'] for data in companies_data])
+    }
+    if len(existing) == len(companies_data):
+        for data in companies_data:
+            print(f"Company already exists: {existing[data['slug']].name}")
+        return [existing[data['slug']] for data in companies_data]
+    
     created_companies = []
+    new_slugs = []
     
     for data in companies_data:
         company, created = Company.objects.get_or_create(
@@ -67,80 +73,90 @@ def seed_companies():
                 'email': data['email'],
                 'phone': data['phone'],
                 'address': data['address'],
-                'db_name': f"tenant_{data['slug']}",
+                'db_name': 'tenant_' + data['slug'],
             }
         )
         
         if created:
             print(f"Created company: {company.name}")
-            # Create tenant database
-            create_tenant_database(company.slug)
+            new_slugs.append(company.slug)
         else:
             print(f"Company already exists: {company.name}")
         
         created_companies.append(company)
     
+    # Create the new tenant databases concurrently (file I/O only, no ORM)
+    if new_slugs:
+        with ProcessPoolExecutor(max_workers=min(len(new_slugs), os.cpu_count() or 1)) as executor:
+            list(executor.map(create_tenant_database, new_slugs))
+    
     return created_companies
 
 
 def seed_users(companies):
     """Create sample users for each company."""
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+    from django.db import transaction
+    
+    User = get_user_model()
     
+    # (role, first name, password, label) for the users of every company
+    users_data = [
+        ('admin', 'Admin', 'admin123', 'admin user'),
+        ('manager', 'Manager', 'manager123', 'manager user'),
+        ('user', 'User', 'user123', 'regular user'),
+    ]
+    
+    wanted = {}
     for company in companies:
-        # Create admin user
-        admin_email = f"admin@{company.slug.replace('-', '')}.com"
-        admin, created = User.objects.get_or_create(
-            email=admin_email,
-            defaults={
-                'first_name': 'Admin',
-                'last_name': company.name.split()[0],
-                'company': company,
-                'role': 'admin',
-                'is_active': True,
-            }
-        )
-        if created:
-            admin.set_password('admin123')
-            admin.save()
-            print(f"Created admin user: {admin.email}")
-        
-        # Create manager user
-        manager_email = f"manager@{company.slug.replace('-', '')}.com"
-        manager, created = User.objects.get_or_create(
-            email=manager_email,
-            defaults={
-                'first_name': 'Manager',
-                'last_name': company.name.split()[0],
-                'company': company,
-                'role': 'manager',
-                'is_active': True,
-            }
-        )
-        if created:
-            manager.set_password('manager123')
-            manager.save()
-            print(f"Created manager user: {manager.email}")
-        
-        # Create regular user
-        user_email = f"user@{company.slug.replace('-', '')}.com"
-        user, created = User.objects.get_or_create(
-            email=user_email,
-            defaults={
-                'first_name': 'User',
-                'last_name': company.name.split()[0],
-                'company': company,
-                'role': 'user',
-                'is_active': True,
-            }
-        )
-        if created:
-            user.set_password('user123')
-            user.save()
-            print(f"Created regular user: {user.email}")
+        email_suffix = '@' + company.slug.replace('-', '') + '.com'
+        last_name = company.name.split(None, 1)[0]
+        for role, first_name, password, label in users_data:
+            wanted[role + email_suffix] = (company, last_name, role, first_name, password, label)
+    
+    # One query for the users already seeded, one INSERT for the rest
+    existing = set(
+        User.objects.filter(email__in=wanted).values_list('email', flat=True)
+    )
+    missing = [email for email in wanted if email not in existing]
+    
+    # Re-runs: nothing to insert and no passwords to hash
+    if not missing:
+        return
+    
+    # Hash each distinct password once rather than once per user
+    hashed_passwords = {
+        password: make_password(password)
+        for password in {wanted[email][4] for email in missing}
+    }
+    
+    new_users = []
+    for email in missing:
+        company, last_name, role, first_name, password, label = wanted[email]
+        new_users.append((label, User(
+            email=email,
+            password=hashed_passwords[password],
+            first_name=first_name,
+            last_name=last_name,
+            company=company,
+            role=role,
+            is_active=True,
+        )))
+    
+    with transaction.atomic():
+        User.objects.bulk_create([user for _, user in new_users])
+    
+    for label, user in new_users:
+        print(f"Created {label}: {user.email}")
 
 
 def seed_products(companies):
     """Create sample products for each company."""
+    from django.db import connections, transaction
+    from django.utils.text import slugify
+    from apps.core.db_router import set_current_db_name, get_tenant_db_alias
+    from apps.products.models import Product
     
     products_data = [
         {
@@ -205,38 +221,76 @@ def seed_products(companies):
         },
     ]
     
-    for company in companies:
-        print(f"\nSeeding products for: {company.name}")
+    def seed_company(company):
+        """Seed one company's products, returning the lines to print."""
+        lines = [f"\nSeeding products for: {company.name}"]
         
-        # Set the tenant database context
+        # Set the tenant database context (thread-local, so per worker)
         db_alias = get_tenant_db_alias(company.slug)
         set_current_db_name(db_alias)
         
-        for data in products_data:
-            # Add company-specific prefix to SKU to make it unique
-            sku = f"{company.slug[:3].upper()}-{data['sku']}"
-            
-            product, created = Product.objects.using(db_alias).get_or_create(
-                sku=sku,
-                defaults={
-                    'name': data['name'],
-                    'description': data['description'],
-                    'price': data['price'],
-                    'cost_price': data['cost_price'],
-                    'quantity': data['quantity'],
-                    'status': data['status'],
-                    'is_featured': data['is_featured'],
-                }
+        # Add company-specific prefix to SKU to make it unique
+        sku_prefix = company.slug[:3].upper() + '-'
+        wanted = {sku_prefix + data['sku']: data for data in products_data}
+        
+        try:
+            # One query for the SKUs already seeded
+            existing = set(
+                Product.objects.using(db_alias)
+                .filter(sku__in=wanted)
+                .values_list('sku', flat=True)
             )
             
-            if created:
-                print(f"  Created product: {product.name} ({sku})")
-            else:
-                print(f"  Product already exists: {product.name} ({sku})")
+            missing = []
+            for sku, data in wanted.items():
+                if sku in existing:
+                    lines.append(f"  Product already exists: {data['name']} ({sku})")
+                else:
+                    missing.append(sku)
+            
+            # Re-runs: nothing to insert for this tenant
+            if not missing:
+                return lines
+            
+            # The slug lookup and the insert share one transaction
+            # on the tenant connection
+            with transaction.atomic(using=db_alias):
+                # bulk_create skips Product.save(), which fills in the
+                # slug, so pick free slugs for the whole batch up front
+                slugs = Product.free_slugs(
+                    [slugify(wanted[sku]['name']) for sku in missing],
+                    using=db_alias,
+                )
+                
+                new_products = []
+                # Passing the ids skips the per-instance uuid4() default
+                for sku, product_id, slug in zip(missing, _bulk_uuids(len(missing)), slugs):
+                    product = Product(id=product_id, slug=slug, **{**wanted[sku], 'sku': sku})
+                    new_products.append(product)
+                
+                # One INSERT for all of them
+                Product.objects.using(db_alias).bulk_create(new_products, batch_size=500)
+            
+            for product in new_products:
+                lines.append(f"  Created product: {product.name} ({product.sku})")
+        finally:
+            # Worker threads' connections are not closed by Django
+            connections[db_alias].close()
+        
+        return lines
+    
+    # Tenant databases are separate files, so their inserts can overlap;
+    # each worker thread gets its own Django connection
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(companies)))) as executor:
+        for lines in executor.map(seed_company, companies):
+            print('\n'.join(lines))
 
 
 def seed_superuser():
     """Create a superuser for Django admin."""
+    from django.contrib.auth import get_user_model
+    
+    User = get_user_model()
     
     superuser_email = 'superadmin@productmanagement.local'
     
@@ -255,6 +309,14 @@ def seed_superuser():
 
 def main():
     """Run all seeders."""
+    argparse.ArgumentParser(description='Seed the databases with sample data').parse_args()
+    
+    # Set up Django only once we know we are seeding (not for --help);
+    # config.settings also loads .env
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+    
     print("=" * 60)
     print("SEEDING DATABASE WITH SAMPLE DATA")
     print("=" * 60)